@@ -14,26 +14,36 @@ The updater is expected to be the enclave-managed signer (GlobalSigner/TxProxy)
 in production, but for Neo Express we use the `tee` wallet created by
 `deploy/scripts/setup_neoexpress.sh`.
 
+Queued invocations are submitted through a single `neoxp batch` run so the
+dotnet runtime starts once per phase rather than once per call. Pass
+`--no-batch` to fall back to one `neoxp contract run` per invocation.
+
 Usage:
-  python3 deploy/scripts/initialize.py [neoexpress|testnet]
+  python3 deploy/scripts/initialize.py [neoexpress|testnet] [--no-batch]
 """
 
 from __future__ import annotations
 
+import argparse
+import base64
+import binascii
 import json
 import os
 import shutil
 import subprocess
-import sys
+import tempfile
+import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent.parent
 CONFIG_DIR = PROJECT_ROOT / "deploy" / "config"
 DEPLOYED_FILE = CONFIG_DIR / "deployed_contracts.json"
 
+PLATFORM_UPDATER_CONTRACTS = ("PriceFeed", "RandomnessLog", "AutomationAnchor", "ServiceLayerGateway")
+
 
 def reverse_hash160(value: str) -> str:
     """
@@ -50,6 +60,20 @@ def reverse_hash160(value: str) -> str:
     return "0x" + raw[::-1].hex()
 
 
+def stack_item_hex(item: Optional[Dict[str, Any]]) -> str:
+    """
+    Return the raw bytes of a `ByteString`/`Buffer` RPC stack item as 0x-prefixed hex.
+
+    Anything else (null, `Any`, integers) yields an empty string.
+    """
+    if not item or item.get("type") not in ("ByteString", "Buffer"):
+        return ""
+    try:
+        return "0x" + base64.b64decode(item.get("value", ""), validate=True).hex()
+    except (binascii.Error, ValueError):
+        return ""
+
+
 def resolve_neoxp() -> str:
     override = os.environ.get("NEOXP", "neoxp")
     resolved = shutil.which(override)
@@ -101,21 +125,25 @@ NETWORKS = {
 
 
 class PlatformInitializer:
-    def __init__(self, network: str = "neoexpress"):
+    def __init__(self, network: str = "neoexpress", batch: bool = True):
         cfg = NETWORKS.get(network)
         if cfg is None:
             raise ValueError(f"unknown network: {network}")
         self.network = cfg
+        self.batch = batch
         self.neoxp = resolve_neoxp()
         self.env = dotnet_env()
         self.deployed = self._load_deployed_contracts()
+        self._wallets = self._load_wallets()
+        self._tee_account = self._wallet_account("tee")
+        self._pending: List[Tuple[str, str, Tuple[str, ...], str]] = []
 
     def _load_deployed_contracts(self) -> Dict[str, str]:
         if not DEPLOYED_FILE.exists():
             raise FileNotFoundError(f"Deployed contracts file not found: {DEPLOYED_FILE}")
         return json.loads(DEPLOYED_FILE.read_text())
 
-    def _wallet_account(self, wallet_name: str) -> Dict[str, Any]:
+    def _load_wallets(self) -> Dict[str, Any]:
         if not self.network.neo_express_config:
             return {}
 
@@ -127,9 +155,10 @@ class PlatformInitializer:
         )
         if result.returncode != 0:
             raise RuntimeError(f"Failed to list wallets: {result.stderr or result.stdout}")
+        return json.loads(result.stdout)
 
-        wallets = json.loads(result.stdout)
-        entry = wallets.get(wallet_name)
+    def _wallet_account(self, wallet_name: str) -> Dict[str, Any]:
+        entry = self._wallets.get(wallet_name)
         if entry is None:
             return {}
         if isinstance(entry, list):
@@ -142,7 +171,9 @@ class PlatformInitializer:
         contract_hash = self.deployed.get(contract_name)
         if not contract_hash:
             raise RuntimeError(f"contract not found in deployed_contracts.json: {contract_name}")
+        self._contract_run(contract_hash, method, tuple(str(a) for a in args), signer)
 
+    def _contract_run(self, contract_hash: str, method: str, args: Tuple[str, ...], signer: str) -> None:
         if not self.network.neo_express_config:
             raise RuntimeError("RPC-only initialization is not implemented; use neoexpress or initialize manually.")
 
@@ -156,31 +187,119 @@ class PlatformInitializer:
             signer,
             contract_hash,
             method,
+            *args,
         ]
-        cmd.extend(str(a) for a in args)
 
         result = subprocess.run(cmd, capture_output=True, text=True, env=self.env)
         if result.returncode != 0:
             raise RuntimeError(f"neoxp invoke failed: {result.stderr or result.stdout}")
 
+    def read(self, calls: List[Tuple[str, str]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Test-invoke parameterless read methods as one JSON-RPC batch of `invokefunction` calls.
+
+        `calls` is a list of `(contract_name, method)`. Returns the first result stack item per
+        call, or None when the node is unreachable or the invocation did not HALT.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        if not calls:
+            return results
+
+        batch = [
+            {"jsonrpc": "2.0", "id": i, "method": "invokefunction", "params": [self.deployed[name], method, []]}
+            for i, (name, method) in enumerate(calls)
+        ]
+        request = urllib.request.Request(
+            self.network.rpc_url,
+            data=json.dumps(batch).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                replies = json.loads(response.read())
+        except (OSError, ValueError):
+            return results
+        if not isinstance(replies, list):
+            return results
+
+        for reply in replies:
+            idx = reply.get("id") if isinstance(reply, dict) else None
+            result = (reply.get("result") if isinstance(reply, dict) else None) or {}
+            if isinstance(idx, int) and 0 <= idx < len(calls) and result.get("state") == "HALT" and result.get("stack"):
+                results[idx] = result["stack"][0]
+        return results
+
+    def queue(self, contract_name: str, method: str, *args: str, signer: str = "owner") -> None:
+        """Defer an invocation until the next `flush()` so a phase can be submitted together."""
+        contract_hash = self.deployed.get(contract_name)
+        if not contract_hash:
+            raise RuntimeError(f"contract not found in deployed_contracts.json: {contract_name}")
+        tokens = tuple(str(a) for a in args)
+        # Batch files are split on whitespace, so a token containing spaces or quotes would
+        # not reach neoxp as a single argument. Reject it rather than diverge from --no-batch.
+        for token in (method, *tokens, signer):
+            if not token or any(c.isspace() or c in "\"'" for c in token):
+                raise ValueError(f"cannot queue argument for neoxp batch: {token!r}")
+        self._pending.append((contract_hash, method, tokens, signer))
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        if not self.batch or len(pending) == 1:
+            for contract_hash, method, args, signer in pending:
+                self._contract_run(contract_hash, method, args, signer)
+            return
+
+        if not self.network.neo_express_config:
+            raise RuntimeError("RPC-only initialization is not implemented; use neoexpress or initialize manually.")
+
+        lines = [
+            " ".join(["contract", "run", contract_hash, method, *args, "--account", signer])
+            for contract_hash, method, args, signer in pending
+        ]
+        fd, batch_file = tempfile.mkstemp(suffix=".batch")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            result = subprocess.run(
+                [self.neoxp, "batch", "-i", self.network.neo_express_config, batch_file],
+                capture_output=True,
+                text=True,
+                env=self.env,
+            )
+        finally:
+            os.unlink(batch_file)
+        if result.returncode != 0:
+            raise RuntimeError(f"neoxp batch failed: {result.stderr or result.stdout}")
+
     def set_platform_updaters(self) -> None:
         if not self.network.neo_express_config:
             return
 
-        tee_account = self._wallet_account("tee")
-        tee_hash = tee_account.get("script-hash", "")
+        tee_hash = self._tee_account.get("script-hash", "")
         if not tee_hash:
             raise RuntimeError("TEE wallet not found or missing script-hash (expected wallet name: tee)")
 
         updater_arg = reverse_hash160(tee_hash)
 
+        # Skip contracts whose updater already matches. The stored UInt160 is compared in the
+        # same byte order it was written with; if the node can't be reached, every call is sent.
+        deployed = [name for name in PLATFORM_UPDATER_CONTRACTS if name in self.deployed]
+        current = dict(zip(deployed, self.read([(name, "updater") for name in deployed])))
+
         print("\n=== Setting platform Updater (TEE signer) ===")
-        for contract_name in ("PriceFeed", "RandomnessLog", "AutomationAnchor", "ServiceLayerGateway"):
+        for contract_name in PLATFORM_UPDATER_CONTRACTS:
             if contract_name not in self.deployed:
                 print(f"  - {contract_name}: not deployed, skipping")
                 continue
+            if stack_item_hex(current[contract_name]) == updater_arg:
+                print(f"  - {contract_name}: updater already {tee_hash}, skipping")
+                continue
             print(f"  - {contract_name}.setUpdater({tee_hash})")
-            self.invoke(contract_name, "setUpdater", updater_arg)
+            self.queue(contract_name, "setUpdater", updater_arg)
+        self.flush()
 
     def run(self) -> None:
         if self.network.name != "neoexpress":
@@ -194,8 +313,16 @@ class PlatformInitializer:
 
 
 def main() -> None:
-    network = sys.argv[1] if len(sys.argv) > 1 else "neoexpress"
-    PlatformInitializer(network).run()
+    parser = argparse.ArgumentParser(description="Initialize deployed MiniApp platform contracts.")
+    parser.add_argument("network", nargs="?", default="neoexpress", choices=sorted(NETWORKS))
+    parser.add_argument(
+        "--no-batch",
+        dest="batch",
+        action="store_false",
+        help="invoke contracts one `neoxp contract run` at a time instead of a single `neoxp batch`",
+    )
+    args = parser.parse_args()
+    PlatformInitializer(args.network, batch=args.batch).run()
 
 
 if __name__ == "__main__":
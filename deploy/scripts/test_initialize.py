@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Self-checks for initialize.py: queue/flush batching and the updater skip guard.
+
+Run with:
+  python3 -m unittest discover -s deploy/scripts -p "test_*.py"
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import json
+import os
+import subprocess
+import unittest
+from unittest import mock
+
+import initialize
+from initialize import PlatformInitializer, reverse_hash160, stack_item_hex
+
+TEE_HASH = "0x00112233445566778899aabbccddeeff00112233"
+
+
+def updater_item(script_hash: str) -> dict:
+    """
+    Stack item holding the same bytes the setUpdater argument for `script_hash` was written with.
+
+    This mirrors the guard's byte-order assumption; it does not verify how neoxp stores the value.
+    """
+    raw = bytes.fromhex(script_hash[2:])[::-1]
+    return {"type": "ByteString", "value": base64.b64encode(raw).decode()}
+
+
+def make_initializer(deployed: dict, batch: bool = True) -> PlatformInitializer:
+    init = PlatformInitializer.__new__(PlatformInitializer)
+    init.network = initialize.NETWORKS["neoexpress"]
+    init.batch = batch
+    init.neoxp = "neoxp"
+    init.env = {}
+    init.deployed = deployed
+    init._wallets = {}
+    init._tee_account = {"script-hash": TEE_HASH}
+    init._pending = []
+    return init
+
+
+def rpc_reply(replies):
+    return mock.patch.object(
+        initialize.urllib.request, "urlopen", return_value=io.BytesIO(json.dumps(replies).encode())
+    )
+
+
+class FakeNeoxp:
+    """Stub for `subprocess.run` that records argv and the batch file contents at call time."""
+
+    def __init__(self, returncode: int = 0):
+        self.returncode = returncode
+        self.calls = []
+        self.batch_files = []
+
+    def __call__(self, cmd, **kwargs):
+        self.calls.append(cmd)
+        if cmd[1] == "batch":
+            self.batch_files.append(cmd[-1])
+            with open(cmd[-1]) as f:
+                self.batch_lines = f.read().splitlines()
+        return subprocess.CompletedProcess(cmd, self.returncode, stdout="", stderr="boom")
+
+
+def run_cmd(init: PlatformInitializer, contract_hash: str, method: str, *args: str, signer: str = "owner"):
+    return [
+        "neoxp", "contract", "run", "-i", init.network.neo_express_config, "-a", signer, contract_hash, method, *args
+    ]
+
+
+class QueueFlushTest(unittest.TestCase):
+    DEPLOYED = {"PriceFeed": "0x" + "aa" * 20, "RandomnessLog": "0x" + "bb" * 20, "AppRegistry": "0x" + "cc" * 20}
+
+    def flush(self, init: PlatformInitializer, fake: FakeNeoxp) -> None:
+        with mock.patch.object(initialize.subprocess, "run", side_effect=fake):
+            init.flush()
+
+    def test_batch_file_lists_queued_calls_in_order(self):
+        init = make_initializer(self.DEPLOYED)
+        init.queue("RandomnessLog", "setUpdater", "0x01")
+        init.queue("PriceFeed", "setUpdater", "0x02", signer="tee")
+        init.queue("AppRegistry", "pause")
+        fake = FakeNeoxp()
+        self.flush(init, fake)
+
+        self.assertEqual(len(fake.calls), 1)
+        self.assertEqual(fake.calls[0][:4], ["neoxp", "batch", "-i", init.network.neo_express_config])
+        self.assertEqual(
+            fake.batch_lines,
+            [
+                f"contract run {self.DEPLOYED['RandomnessLog']} setUpdater 0x01 --account owner",
+                f"contract run {self.DEPLOYED['PriceFeed']} setUpdater 0x02 --account tee",
+                f"contract run {self.DEPLOYED['AppRegistry']} pause --account owner",
+            ],
+        )
+        self.assertFalse(os.path.exists(fake.batch_files[0]))
+        self.assertEqual(init._pending, [])
+
+    def test_single_call_uses_contract_run(self):
+        init = make_initializer(self.DEPLOYED)
+        init.queue("PriceFeed", "setUpdater", "0x01")
+        fake = FakeNeoxp()
+        self.flush(init, fake)
+
+        self.assertEqual(fake.calls, [run_cmd(init, self.DEPLOYED["PriceFeed"], "setUpdater", "0x01")])
+
+    def test_no_batch_runs_each_call_in_order(self):
+        init = make_initializer(self.DEPLOYED, batch=False)
+        init.queue("RandomnessLog", "setUpdater", "0x01")
+        init.queue("PriceFeed", "setUpdater", "0x02", signer="tee")
+        fake = FakeNeoxp()
+        self.flush(init, fake)
+
+        self.assertEqual(
+            fake.calls,
+            [
+                run_cmd(init, self.DEPLOYED["RandomnessLog"], "setUpdater", "0x01"),
+                run_cmd(init, self.DEPLOYED["PriceFeed"], "setUpdater", "0x02", signer="tee"),
+            ],
+        )
+
+    def test_batch_file_removed_when_batch_fails(self):
+        init = make_initializer(self.DEPLOYED)
+        init.queue("PriceFeed", "setUpdater", "0x01")
+        init.queue("RandomnessLog", "setUpdater", "0x01")
+        fake = FakeNeoxp(returncode=1)
+        with self.assertRaisesRegex(RuntimeError, "neoxp batch failed: boom"):
+            self.flush(init, fake)
+
+        self.assertEqual(len(fake.batch_files), 1)
+        self.assertFalse(os.path.exists(fake.batch_files[0]))
+
+    def test_queue_rejects_unsplittable_arguments(self):
+        init = make_initializer(self.DEPLOYED)
+        for args, signer in [
+            (("a b",), "owner"),
+            (("a\tb",), "owner"),
+            (('a"b',), "owner"),
+            (("a'b",), "owner"),
+            (("",), "owner"),
+            (("0x01",), "own er"),
+            (("0x01",), ""),
+        ]:
+            with self.subTest(args=args, signer=signer), self.assertRaises(ValueError):
+                init.queue("PriceFeed", "setUpdater", *args, signer=signer)
+        self.assertEqual(init._pending, [])
+
+
+class StackItemHexTest(unittest.TestCase):
+    def test_decodes_raw_bytes_in_stored_order(self):
+        item = {"type": "ByteString", "value": "ABEiM0RVZneImaq7zN3u/wARIjM="}
+        self.assertEqual(stack_item_hex(item), "0x00112233445566778899aabbccddeeff00112233")
+        self.assertEqual(stack_item_hex({**item, "type": "Buffer"}), "0x00112233445566778899aabbccddeeff00112233")
+
+    def test_non_bytes_items_are_empty(self):
+        self.assertEqual(stack_item_hex(None), "")
+        self.assertEqual(stack_item_hex({"type": "Any"}), "")
+        self.assertEqual(stack_item_hex({"type": "Integer", "value": "1"}), "")
+        self.assertEqual(stack_item_hex({"type": "ByteString", "value": "not base64!"}), "")
+
+
+class ReadTest(unittest.TestCase):
+    def test_batch_replies_are_matched_by_id(self):
+        init = make_initializer({name: f"0x{i:040x}" for i, name in enumerate("ABCDE")})
+        halt = {"state": "HALT", "stack": [updater_item(TEE_HASH)]}
+        replies = [
+            {"jsonrpc": "2.0", "id": 3, "result": {"state": "FAULT", "stack": []}},
+            {"jsonrpc": "2.0", "id": 0, "result": halt},
+            {"jsonrpc": "2.0", "id": 2, "error": {"code": -100, "message": "Unknown contract"}},
+            {"jsonrpc": "2.0", "result": halt},
+        ]
+        with rpc_reply(replies) as urlopen:
+            results = init.read([(name, "updater") for name in "ABCDE"])
+
+        sent = json.loads(urlopen.call_args.args[0].data)
+        self.assertEqual([call["id"] for call in sent], [0, 1, 2, 3, 4])
+        self.assertEqual(results, [halt["stack"][0], None, None, None, None])
+
+    def test_unreachable_node_reads_nothing(self):
+        init = make_initializer({"A": "0x" + "aa" * 20})
+        with mock.patch.object(initialize.urllib.request, "urlopen", side_effect=OSError("refused")):
+            self.assertEqual(init.read([("A", "updater")]), [None])
+
+
+class SetPlatformUpdatersTest(unittest.TestCase):
+    def test_only_mismatched_updaters_are_queued(self):
+        init = make_initializer({"PriceFeed": "0x" + "aa" * 20, "RandomnessLog": "0x" + "bb" * 20})
+        replies = [
+            {"jsonrpc": "2.0", "id": 0, "result": {"state": "HALT", "stack": [updater_item(TEE_HASH)]}},
+            {"jsonrpc": "2.0", "id": 1, "result": {"state": "HALT", "stack": [{"type": "Any"}]}},
+        ]
+        with rpc_reply(replies), mock.patch.object(init, "flush"), mock.patch("builtins.print"):
+            init.set_platform_updaters()
+
+        self.assertEqual(init._pending, [("0x" + "bb" * 20, "setUpdater", (reverse_hash160(TEE_HASH),), "owner")])
+
+
+if __name__ == "__main__":
+    unittest.main()